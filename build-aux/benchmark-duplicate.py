@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+#
+# benchmark-duplicate.py
+#
+# Copyright 2026 Naufan Rusyda Faikar
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+#
+# Measure the perceptual hash throughput over thumbnail-sized JPEGs and the
+# near-duplicate query time over a synthetic collection of hashes.
+#
+# Usage: python3 build-aux/benchmark-duplicate.py [n_images] [threshold]
+
+from io import BytesIO
+from pathlib import Path
+from PIL import Image
+from random import Random
+from time import perf_counter
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from duplicate import HashIndex
+from duplicate import compute_image_hash
+from duplicate import group_duplicates
+
+def make_thumbnails(count:  int,
+                    bucket: int = 256,
+                    ) ->    list[bytes]:
+    """"""
+    thumbnails = []
+    for seed in range(count):
+        image = Image.effect_noise((bucket, bucket * 2 // 3), 16 + seed % 64)
+        buffer = BytesIO()
+        image.convert('RGB').save(buffer, format = 'JPEG', quality = 85)
+        thumbnails.append(buffer.getvalue())
+    return thumbnails
+
+def make_hashes(count: int,
+                rng:   Random,
+                ) ->   dict[int, int]:
+    """"""
+    hashes = {}
+    for index in range(count):
+        # Roughly one in ten images is a near-duplicate of an earlier one
+        if index and rng.random() < 0.1:
+            value = hashes[rng.randrange(index)]
+            for _ in range(rng.randint(0, 4)):
+                value ^= 1 << rng.randrange(64)
+        else:
+            value = rng.getrandbits(64)
+        hashes[index] = value
+    return hashes
+
+def main() -> None:
+    """"""
+    n_images = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    threshold = int(sys.argv[2]) if len(sys.argv) > 2 else 7
+
+    thumbnails = make_thumbnails(500)
+    start = perf_counter()
+    for data in thumbnails:
+        compute_image_hash(data)
+    elapsed = perf_counter() - start
+    print(f'hash:   {len(thumbnails) / elapsed:10.1f} thumbnails/s')
+
+    rng = Random(0)
+    hashes = make_hashes(n_images, rng)
+
+    start = perf_counter()
+    index = HashIndex()
+    for key, value in hashes.items():
+        index.add(value, key)
+    elapsed = perf_counter() - start
+    print(f'build:  {elapsed * 1_000:10.1f} ms for {n_images} hashes')
+
+    values = list(hashes.values())
+    queries = [rng.choice(values) for _ in range(1_000)]
+    start = perf_counter()
+    for value in queries:
+        index.search(value, threshold)
+    elapsed = perf_counter() - start
+    print(f'query:  {elapsed / len(queries) * 1_000:10.3f} ms/query (threshold {threshold})')
+
+    # Reference point for the brute-force linear scan
+    start = perf_counter()
+    for value in queries[:100]:
+        [other for other in values if (value ^ other).bit_count() <= threshold]
+    elapsed = perf_counter() - start
+    print(f'linear: {elapsed / 100 * 1_000:10.3f} ms/query')
+
+    start = perf_counter()
+    groups = group_duplicates(hashes, threshold)
+    elapsed = perf_counter() - start
+    print(f'group:  {elapsed:10.2f} s for {len(groups)} groups')
+
+if __name__ == '__main__':
+    main()
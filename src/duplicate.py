@@ -0,0 +1,161 @@
+# duplicate.py
+#
+# Copyright 2026 Naufan Rusyda Faikar
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: AGPL-3.0-or-later
+
+from functools import cache
+from io import BytesIO
+from itertools import combinations
+from PIL import Image
+from typing import Hashable
+
+HASH_SIZE = 8 # produces a 64-bit hash
+HASH_BYTES = HASH_SIZE * HASH_SIZE // 8
+
+def compute_image_hash(data: bytes) -> int:
+    """Compute the difference hash (dHash) of an encoded image thumbnail."""
+    with Image.open(BytesIO(data)) as image:
+        # Let the JPEG decoder do most of the downscaling for us
+        image.draft('L', (HASH_SIZE * 4, HASH_SIZE * 4))
+
+        image = image.convert('L')
+        image = image.resize((HASH_SIZE + 1, HASH_SIZE), Image.BOX)
+
+        pixels = image.tobytes()
+
+    value = 0
+    for row in range(HASH_SIZE):
+        offset = row * (HASH_SIZE + 1)
+        for col in range(offset, offset + HASH_SIZE):
+            value = (value << 1) | (pixels[col] < pixels[col + 1])
+    return value
+
+class HashIndex:
+    """Multi-index hashing over 64-bit hashes in the Hamming space.
+
+    Each hash is split into disjoint chunks, each indexed by its own table.
+    By the pigeonhole principle, two hashes within distance t must agree on
+    at least one chunk up to t // n_chunks bits, so a query only has to probe
+    the neighbourhood of its own chunks instead of scanning everything.
+    """
+
+    N_CHUNKS = 4
+    CHUNK_BITS = HASH_SIZE * HASH_SIZE // N_CHUNKS
+    CHUNK_MASK = (1 << CHUNK_BITS) - 1
+
+    def __init__(self) -> None:
+        """"""
+        self._tables = [{} for _ in range(self.N_CHUNKS)]
+        self._values = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        """"""
+        return self._size
+
+    def add(self,
+            value: int,
+            key:   Hashable,
+            ) ->   None:
+        """"""
+        self._size += 1
+
+        # Identical hashes share a single entry
+        if value in self._values:
+            self._values[value].append(key)
+            return
+
+        self._values[value] = [key]
+
+        for i, table in enumerate(self._tables):
+            chunk = (value >> (i * self.CHUNK_BITS)) & self.CHUNK_MASK
+            table.setdefault(chunk, []).append(value)
+
+    def search(self,
+               value:     int,
+               threshold: int,
+               ) ->       list[tuple[int, Hashable]]:
+        """Find all keys whose hash is within the given Hamming distance."""
+        masks = _get_flip_masks(self.CHUNK_BITS, threshold // self.N_CHUNKS)
+
+        candidates = set()
+        for i, table in enumerate(self._tables):
+            chunk = (value >> (i * self.CHUNK_BITS)) & self.CHUNK_MASK
+            for mask in masks:
+                if bucket := table.get(chunk ^ mask):
+                    candidates.update(bucket)
+
+        results = []
+        for candidate in candidates:
+            distance = (candidate ^ value).bit_count()
+            if distance <= threshold:
+                results.extend((distance, key) for key in self._values[candidate])
+        return results
+
+@cache
+def _get_flip_masks(n_bits: int,
+                    radius: int,
+                    ) ->    tuple[int, ...]:
+    """"""
+    masks = []
+    for n_flips in range(radius + 1):
+        for positions in combinations(range(n_bits), n_flips):
+            mask = 0
+            for position in positions:
+                mask |= 1 << position
+            masks.append(mask)
+    return tuple(masks)
+
+def group_duplicates(hashes:    dict[Hashable, int],
+                     threshold: int = 7,
+                     ) ->       list[list[Hashable]]:
+    """Group keys whose hashes are within the threshold of a group leader.
+
+    Every member is compared against the first member of its group rather
+    than against any member, so chains of near-duplicates cannot merge
+    unrelated images into one large group. Members of a group are hence
+    at most twice the threshold apart from each other.
+    """
+    index = HashIndex()
+    unique = {}
+
+    for key, value in hashes.items():
+        if value in unique:
+            unique[value].append(key)
+        else:
+            unique[value] = [key]
+            index.add(value, value)
+
+    groups = []
+    assigned = set()
+
+    for leader, keys in unique.items():
+        if leader in assigned:
+            continue
+
+        assigned.add(leader)
+        group = list(keys)
+
+        for _, other in index.search(leader, threshold):
+            if other not in assigned:
+                assigned.add(other)
+                group.extend(unique[other])
+
+        if len(group) > 1:
+            groups.append(group)
+
+    return groups
@@ -45,6 +45,8 @@ class Application(Adw.Application):
                                     ['<Primary>q'])
         self.create_action('about', self._on_about_action,
                                     ['F12'])
+        self.create_action('find-duplicates', self._on_find_duplicates_action,
+                                              ['<Primary>d'])
 
         from .canvas import Canvas
         GObject.type_register(Canvas)
@@ -75,6 +77,14 @@ class Application(Adw.Application):
         window = self.props.active_window
         about.present(window)
 
+    def _on_find_duplicates_action(self,
+                                   action:    Gio.SimpleAction,
+                                   parameter: GLib.Variant,
+                                   ) ->       None:
+        """"""
+        window = self.props.active_window
+        window.find_duplicates()
+
     def create_action(self,
                       name:      str,
                       callback:  callable  = None,
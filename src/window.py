@@ -28,13 +28,19 @@ from hashlib import sha1
 from io import BytesIO
 from math import copysign
 from math import exp
+from os import replace
 from pathlib import Path
 from pathlib import PosixPath
 from PIL import Image
 from PIL import ImageOps
 from threading import Thread
+from threading import get_ident
 from typing import Any
 
+from .duplicate import HASH_BYTES
+from .duplicate import compute_image_hash
+from .duplicate import group_duplicates
+
 @Gtk.Template(resource_path = '/com/macipra/alusin/window.ui')
 class Window(Adw.ApplicationWindow):
     __gtype_name__ = 'Window'
@@ -66,6 +72,8 @@ class Window(Adw.ApplicationWindow):
 
         self._inertia_tick_id = 0
 
+        self._finding_duplicates = False
+
         self._setup_data()
         self._setup_controllers()
 
@@ -270,17 +278,7 @@ class Window(Adw.ApplicationWindow):
                            indices: list[int] = [],
                            ) ->     None:
         """"""
-        # Get the monitor where the window resides on
-        surface = self.get_surface()
-        display = self.get_display()
-        monitor = display.get_monitor_at_surface(surface)
-
-        # Calculate image thumbnail height
-        monitor_height = monitor.get_geometry().height
-        thumb_height = self.main_canvas.MAX_ROW_HEIGHT
-        thumb_height *= monitor_height
-#       thumb_height *= 1.5 # try to avoids upscaling artifacts
-
+        thumb_height = self._get_thumbnail_height()
         thumb_dir = self._create_thumbnail_directory()
 
         if indices:
@@ -296,6 +294,21 @@ class Window(Adw.ApplicationWindow):
             for index, path in enumerate(self._image_paths):
                 self._load_image_task(index, thumb_height, thumb_dir, path)
 
+    def _get_thumbnail_height(self) -> float:
+        """"""
+        # Get the monitor where the window resides on
+        surface = self.get_surface()
+        display = self.get_display()
+        monitor = display.get_monitor_at_surface(surface)
+
+        # Calculate image thumbnail height
+        monitor_height = monitor.get_geometry().height
+        thumb_height = self.main_canvas.MAX_ROW_HEIGHT
+        thumb_height *= monitor_height
+#       thumb_height *= 1.5 # try to avoids upscaling artifacts
+
+        return thumb_height
+
     def _load_image_task(self,
                          index:     int,
                          height:    int,
@@ -340,6 +353,135 @@ class Window(Adw.ApplicationWindow):
         digest = sha1(fkey.encode('utf-8')).hexdigest()
         return Path(thumb_dir, digest + '.jpeg')
 
+    def _create_hash_path(self,
+                          thumb_path: PosixPath,
+                          ) ->        PosixPath:
+        """"""
+        return thumb_path.with_suffix('.dhash')
+
+    def _load_image_hash(self,
+                         height:     int,
+                         file_path:  str,
+                         thumb_path: PosixPath,
+                         ) ->        int | None:
+        """"""
+        hash_path = self._create_hash_path(thumb_path)
+
+        # Hashes are computed from the thumbnail, never from the original,
+        # and stored next to it under the same cache key
+        try:
+            data = hash_path.read_bytes()
+            if len(data) == HASH_BYTES:
+                return int.from_bytes(data, 'big')
+        except:
+            pass
+
+        try:
+            value = compute_image_hash(thumb_path.read_bytes())
+        except:
+            # The thumbnail is missing, truncated, or corrupted
+            try:
+                hash_path.unlink(missing_ok = True)
+                fbytes = self._create_image_thumbnail(height, file_path, thumb_path)
+                value = compute_image_hash(fbytes)
+            except:
+                return None
+
+        try:
+            data = value.to_bytes(HASH_BYTES, 'big')
+            self._save_cache_file(data, str(hash_path))
+        except:
+            pass
+
+        return value
+
+    def find_duplicates(self) -> None:
+        """"""
+        if self._finding_duplicates:
+            return
+
+        self._set_finding_duplicates(True)
+
+        thread = Thread(target = self.find_duplicates_worker,
+                        args   = [self._get_thumbnail_height()],
+                        daemon = True)
+        thread.start()
+
+    def find_duplicates_worker(self,
+                               height:    int,
+                               threshold: int = 7,
+                               ) ->       None:
+        """"""
+        # Always report back to the main loop, even when the scan fails,
+        # or the action would stay disabled until the application restarts
+        groups = None
+
+        try:
+            thumb_dir = self._create_thumbnail_directory()
+
+            hashes = {}
+            for index, path in enumerate(self._image_paths):
+                try:
+                    thumb_path = self._create_thumbnail_path(thumb_dir, path)
+                except:
+                    # The image has been deleted or renamed since startup
+                    continue
+
+                value = self._load_image_hash(height, path, thumb_path)
+                if value is not None:
+                    hashes[index] = value
+
+            groups = group_duplicates(hashes, threshold)
+            groups = [[self._image_paths[index] for index in sorted(group)]
+                      for group in groups]
+
+        finally:
+            GLib.idle_add(self._on_duplicates_found,
+                          groups,
+                          priority = GLib.PRIORITY_LOW)
+
+    def _set_finding_duplicates(self,
+                                active: bool,
+                                ) ->    None:
+        """"""
+        self._finding_duplicates = active
+
+        # Grey out the menu entry and its shortcut while scanning
+        application = self.get_application()
+        if action := application.lookup_action('find-duplicates'):
+            action.set_enabled(not active)
+
+    def _on_duplicates_found(self,
+                             groups: list[list[str]] | None,
+                             ) ->    bool:
+        """"""
+        self._set_finding_duplicates(False)
+
+        if groups is None:
+            body = _('Could not finish looking for duplicate images.')
+        elif groups:
+            body = '\n\n'.join('\n'.join(Path(path).name for path in group)
+                               for group in groups)
+        else:
+            body = _('No duplicate images found.')
+
+        label = Gtk.Label(label      = body,
+                          selectable = True,
+                          wrap       = True,
+                          xalign     = 0.0)
+
+        scrolled_window = Gtk.ScrolledWindow(child                    = label,
+                                             hscrollbar_policy        = Gtk.PolicyType.NEVER,
+                                             propagate_natural_height = True,
+                                             max_content_height       = 360)
+
+        dialog = Adw.AlertDialog(heading     = _('Duplicate Images'),
+                                 extra_child = scrolled_window)
+        dialog.add_response('close', _('_Close'))
+        dialog.present(self)
+
+        return GLib.SOURCE_REMOVE
+
     def _create_image_thumbnail(self,
                                 height:      int,
                                 source_path: str,
@@ -368,7 +510,7 @@ class Window(Adw.ApplicationWindow):
 
             fbytes = buffer.getvalue()
 
-        thread = Thread(target = self._save_image_thumbnail,
+        thread = Thread(target = self._save_cache_file,
                         args   = (fbytes, str(target_path)),
                         daemon = True)
         thread.start()
@@ -384,13 +526,21 @@ class Window(Adw.ApplicationWindow):
                 return bucket
         return self.THUMB_BUCKETS[-1]
 
-    def _save_image_thumbnail(self,
+    def _save_cache_file(self,
                               data: bytes,
                               path: str,
                               ) ->  None:
         """"""
-        with open(path, 'wb') as file:
-            file.write(data)
+        # Write to a temporary file first, so that readers never map
+        # a partially written file
+        temp_path = f'{path}.{get_ident()}.tmp'
+        try:
+            with open(temp_path, 'wb') as file:
+                file.write(data)
+            replace(temp_path, path)
+        except:
+            Path(temp_path).unlink(missing_ok = True)
+            raise
 
     def _on_image_loaded(self,
                          index:   int,